@@ -0,0 +1,60 @@
+"""
+Shared long-form table assembly for the synthetic ridership generators.
+
+Both datasets are laid out the same way: replications outer, then routes,
+then weeks. The seeding scheme, the column dtypes and the optional `rep`
+column are defined here once so the two datasets cannot drift apart.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def spawn_route_seeds(seed, n_reps, n_routes):
+    """Return one list of per-rep SeedSequence children for each route.
+
+    Every (rep, route) gets an independent child of SeedSequence(seed),
+    spawned rep-major. Adding reps leaves earlier reps unchanged, and with one
+    rep appending a new route does not change the noise of the existing ones.
+    """
+    if n_reps < 1:
+        raise ValueError(f"n_reps must be at least 1, got {n_reps}")
+    children = np.random.SeedSequence(seed).spawn(n_reps * n_routes)
+    return [children[r::n_routes] for r in range(n_routes)]
+
+
+def make_long_frame(dates, route_names, ridership, post, time_since, extra_cols=None):
+    """Build the long-form dataset from an (n_reps, n_routes, n_weeks) array.
+
+    - route_type is an ordered categorical in route_names order, so rows come
+      out already sorted by (rep,) route and date
+    - avg_ridership is rounded to 0.1 and stored as float32; the intervention
+      mask is int8 and time_since_intervention is int16
+    - extra_cols: optional {name: per-week array}, tiled like the other weekly
+      columns and placed before time_since_intervention, dtype kept as given
+    - with more than one replication, a leading `rep` column labels them,
+      in the smallest integer dtype that holds every label
+
+    Replications share the same deterministic signal and differ only in noise,
+    for Monte Carlo checks of the ITS estimates.
+    """
+    n_reps, n_routes, n_weeks = ridership.shape
+    n_series = n_reps * n_routes
+    
+    route_codes = np.arange(n_routes, dtype=np.min_scalar_type(n_routes - 1))
+    columns = {
+        'date': np.tile(dates, n_series),
+        'route_type': pd.Categorical.from_codes(
+            np.tile(np.repeat(route_codes, n_weeks), n_reps),
+            categories=list(route_names), ordered=True),
+        'avg_ridership': np.round(ridership.ravel(), 1).astype(np.float32),
+        'post_intervention': np.tile(post, n_series).astype(np.int8),
+    }
+    for name, values in (extra_cols or {}).items():
+        columns[name] = np.tile(values, n_series)
+    columns['time_since_intervention'] = np.tile(time_since, n_series).astype(np.int16)
+    
+    if n_reps > 1:
+        rep = np.arange(n_reps, dtype=np.min_scalar_type(n_reps - 1))
+        columns = {'rep': np.repeat(rep, n_routes * n_weeks), **columns}
+    return pd.DataFrame(columns)
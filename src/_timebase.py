@@ -0,0 +1,29 @@
+"""
+Shared weekly time base for the synthetic ridership generators.
+
+Both datasets use the same weekly calendar and the same intervention date,
+so the dates, the post-intervention mask and the weeks since intervention
+are built here once, as arrays, instead of separately in each script.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_timebase(start, end, intervention, freq='7D', n_weeks=None):
+    """Return (dates, post, time_since) for a regular weekly calendar.
+
+    - dates: DatetimeIndex from start to end (inclusive) at the given freq,
+      or exactly n_weeks periods from start when n_weeks is given
+    - post: float 0/1 mask, 1 from the intervention date onwards
+    - time_since: weeks since the intervention, clipped to 0 before it
+    """
+    if n_weeks is not None and n_weeks < 1:
+        raise ValueError(f"n_weeks must be at least 1, got {n_weeks}")
+    if n_weeks is None:
+        dates = pd.date_range(start, end, freq=freq)
+    else:
+        dates = pd.date_range(start, periods=n_weeks, freq=freq)
+    post = (dates >= intervention).astype(float)
+    time_since = np.maximum(0, (dates - intervention).days.values / 7)
+    return dates, post, time_since
@@ -9,149 +9,161 @@ This creates "easy mode" synthetic data with:
 
 Purpose: Learn ITS mechanics before tackling messier realistic data.
 
+Note: the committed CSV was generated with the legacy np.random.seed(42)
+stream. This script draws from per-route SeedSequence streams, so running it
+overwrites that file with a different noise draw (same parameters and ground
+truth). See "Regenerating the data" in the README.
+
 Author: Tomasz Solis
 Date: December 2025
 """
 
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 
-# Set seed for reproducibility
-np.random.seed(42)
+from _longform import make_long_frame, spawn_route_seeds
+from _timebase import make_timebase
 
 # Time parameters
 start_date = datetime(2020, 1, 6)  # Monday
 end_date = datetime(2024, 12, 30)
 intervention_date = datetime(2024, 1, 1)
 
-# Generate weekly dates
-dates = []
-current_date = start_date
-while current_date <= end_date:
-    dates.append(current_date)
-    current_date += timedelta(days=7)
-
 # Route types with different parameters
 routes = ['Downtown', 'Suburban', 'Cross-town']
 
-# Parameters for each route (BASELINE VERSION - LARGE EFFECTS)
-route_params = {
-    'Downtown': {
-        'base_ridership': 500,
-        'pre_trend': 2.45,  # riders per week growth
-        'treatment_effect': 300,  # LARGE immediate jump
-        'slope_change': 0,  # no change in growth rate
-        'noise_std': 20  # low noise for clarity
-    },
-    'Suburban': {
-        'base_ridership': 400,
-        'pre_trend': 1.67,
-        'treatment_effect': 200,  # LARGE immediate jump
-        'slope_change': 0,
-        'noise_std': 15
-    },
-    'Cross-town': {
-        'base_ridership': 300,
-        'pre_trend': 1.09,
-        'treatment_effect': 150,  # LARGE immediate jump
-        'slope_change': 0,
-        'noise_std': 12
-    }
-}
-
-# Generate data
-data = []
-
-for route in routes:
-    params = route_params[route]
+# Parameters for each route (BASELINE VERSION - LARGE EFFECTS), stored as
+# parallel arrays indexed by position in `routes`
+base_ridership = np.array([500, 400, 300], dtype=float)
+pre_trend = np.array([2.45, 1.67, 1.09])  # riders per week growth
+treatment_effect = np.array([300, 200, 150], dtype=float)  # LARGE immediate jump
+slope_change = np.array([0, 0, 0], dtype=float)  # no change in growth rate
+noise_std = np.array([20, 15, 12], dtype=float)  # low noise for clarity
+
+# MINIMAL seasonality (just a hint), looked up by month number (index 0 unused)
+seasonal_offset = np.zeros(13)
+seasonal_offset[[6, 7, 8]] = -30  # Summer dip
+seasonal_offset[[12, 1]] = -20  # Winter dip
+
+def generate_ridership(base, trend, treatment, slope, noise_std,
+                       seasonality, post, time_since, seeds):
+    """Return ridership as an (n_reps, n_routes, n_weeks) array.
     
-    for i, date in enumerate(dates):
-        # Time variables
-        time = i
-        post_intervention = 1 if date >= intervention_date else 0
-        time_since_intervention = max(0, (date - intervention_date).days / 7)
-        
-        # Base ridership with linear trend
-        ridership = params['base_ridership'] + (params['pre_trend'] * time)
-        
-        # Add MINIMAL seasonality (just a hint)
-        month = date.month
-        if month in [6, 7, 8]:  # Summer dip
-            ridership -= 30
-        if month in [12, 1]:  # Winter dip
-            ridership -= 20
-        
-        # Treatment effect (immediate level change)
-        if post_intervention:
-            ridership += params['treatment_effect']
-            ridership += params['slope_change'] * time_since_intervention
-        
-        # Add small random noise
-        ridership += np.random.normal(0, params['noise_std'])
-        
-        # Record observation
-        data.append({
-            'date': date,
-            'route_type': route,
-            'avg_ridership': round(ridership, 1),
-            'post_intervention': post_intervention,
-            'time': time,
-            'time_since_intervention': int(time_since_intervention)
-        })
-
-# Create DataFrame
-df = pd.DataFrame(data)
-
-# Sort by route and date
-df = df.sort_values(['route_type', 'date']).reset_index(drop=True)
-
-# Save to CSV
-output_path = '../data/easy_mode/transit_ridership_baseline.csv'
-df.to_csv(output_path, index=False)
-
-print(f"\nSaved to: {output_path}")
-print(f"Total observations: {len(df):,}")
-print(f"Date range: {df['date'].min().date()} to {df['date'].max().date()}")
-print(f"\nRoute types: {df['route_type'].unique().tolist()}")
-
-# Show summary by route and period
-
-for route in routes:
-    route_data = df[df['route_type'] == route]
-    pre_data = route_data[route_data['post_intervention'] == 0]
-    post_data = route_data[route_data['post_intervention'] == 1]
+    Route parameters are flat arrays in route order; seeds holds one list of
+    per-rep seeds for each route. The deterministic signal is built once, in
+    place, and every replication only adds its own noise.
+    """
+    n_reps, n_routes, n_weeks = len(seeds[0]), len(base), len(seasonality)
+    signal = np.empty((n_routes, n_weeks))
+    out = np.empty((n_reps, n_routes, n_weeks))
     
-    pre_mean = pre_data['avg_ridership'].mean()
-    post_mean = post_data['avg_ridership'].mean()
-    diff = post_mean - pre_mean
+    # Base ridership with linear trend, plus seasonality
+    np.multiply(trend[:, None], np.arange(n_weeks), out=signal)
+    signal += base[:, None]
+    signal += seasonality
     
-    print(f"\n{route}:")
-    print(f"  Pre-intervention mean:  {pre_mean:7.1f} riders")
-    print(f"  Post-intervention mean: {post_mean:7.1f} riders")
-    print(f"  Naive difference:       {diff:+7.1f} riders")
-
-# Show the actual jump at intervention
+    # Treatment effect: level change on the 0/1 post mask, plus any slope
+    # change (time_since is already zero before the intervention)
+    signal += treatment[:, None] * post
+    signal += slope[:, None] * time_since
+    
+    # Add small random noise, each (rep, route) drawn from its own stream
+    for r, route_seeds in enumerate(seeds):
+        for rep, seed in enumerate(route_seeds):
+            np.random.default_rng(seed).standard_normal(out=out[rep, r])
+    out *= noise_std[:, None]
+    out += signal
+    
+    return out
 
-for route in routes:
-    route_data = df[df['route_type'] == route].sort_values('time')
+def generate_baseline_data(n_reps=1, n_weeks=None, seed=42):
+    """Generate the baseline dataset as a long-form DataFrame.
+    
+    n_weeks sets the number of weekly observations from start_date (default:
+    run to end_date). n_reps > 1 stacks independent replications under a
+    leading `rep` column (see _longform.make_long_frame).
+    """
+    # Weekly dates and intervention timing (shared by all routes)
+    dates, post_intervention, time_since_intervention = make_timebase(
+        start_date, end_date, intervention_date, n_weeks=n_weeks)
+    seasonality = seasonal_offset[dates.month.values]
     
-    last_pre = route_data[route_data['post_intervention']==0].iloc[-1]
-    first_post = route_data[route_data['post_intervention']==1].iloc[0]
+    # Random streams for reproducibility: one per (rep, route)
+    seeds = spawn_route_seeds(seed, n_reps, len(routes))
     
-    raw_jump = first_post['avg_ridership'] - last_pre['avg_ridership']
-    expected_trend = route_params[route]['pre_trend']
-    treatment = raw_jump - expected_trend
+    ridership = generate_ridership(
+        base_ridership,
+        pre_trend,
+        treatment_effect,
+        slope_change,
+        noise_std,
+        seasonality,
+        post_intervention,
+        time_since_intervention,
+        seeds
+    )
     
-    print(f"\n{route}:")
-    print(f"  Last pre:  {last_pre['avg_ridership']:7.1f} riders ({last_pre['date'].date()})")
-    print(f"  First post: {first_post['avg_ridership']:7.1f} riders ({first_post['date'].date()})")
-    print(f"  Raw jump: {raw_jump:+7.1f} riders")
-    print(f"  Expected from trend: {expected_trend:+7.1f} riders")
-    print(f"  Treatment effect: {treatment:+7.1f} riders ← Should match β₂ in ITS")
-
-print("\nGround truth treatment effects:")
-print("  Downtown:   +300 riders (immediate level change)")
-print("  Suburban:   +200 riders (immediate level change)")
-print("  Cross-town: +150 riders (immediate level change)")
-print("  All slopes:    0 riders/week (no growth rate change)")
+    # Long-form table, already in route and date order
+    time = np.arange(len(dates), dtype=np.int16)
+    return make_long_frame(dates, routes, ridership, post_intervention,
+                           time_since_intervention, extra_cols={'time': time})
+
+if __name__ == '__main__':
+    df = generate_baseline_data()
+    
+    # Save to CSV
+    output_path = '../data/easy_mode/transit_ridership_baseline.csv'
+    df.to_csv(output_path, index=False)
+
+    print(f"\nSaved to: {output_path}")
+    print(f"Total observations: {len(df):,}")
+    print(f"Date range: {df['date'].min().date()} to {df['date'].max().date()}")
+    print(f"\nRoute types: {df['route_type'].unique().tolist()}")
+
+    # Show summary by route and period
+
+    period_means = (df.groupby(['route_type', 'post_intervention'], sort=False, observed=True)
+                    ['avg_ridership'].mean())
+
+    for route in routes:
+        pre_mean = period_means[(route, 0)]
+        post_mean = period_means[(route, 1)]
+        diff = post_mean - pre_mean
+        
+        print(f"\n{route}:")
+        print(f"  Pre-intervention mean:  {pre_mean:7.1f} riders")
+        print(f"  Post-intervention mean: {post_mean:7.1f} riders")
+        print(f"  Naive difference:       {diff:+7.1f} riders")
+
+    # Show the actual jump at intervention. Route i is rows
+    # i * n_weeks ... (i + 1) * n_weeks - 1 in date order, so the weeks either
+    # side of it are read by position on the calendar the generator used.
+
+    dates, post_intervention, _ = make_timebase(start_date, end_date, intervention_date)
+    n_weeks = len(dates)
+    first_post_week = int(np.searchsorted(post_intervention, 1))
+
+    if not 0 < first_post_week < n_weeks:
+        print("\nNo weeks on both sides of the intervention; skipping raw jump check.")
+    else:
+        for i, route in enumerate(routes):
+            first_post_idx = i * n_weeks + first_post_week
+            last_pre = df.iloc[first_post_idx - 1]
+            first_post = df.iloc[first_post_idx]
+            
+            raw_jump = first_post['avg_ridership'] - last_pre['avg_ridership']
+            expected_trend = pre_trend[i]
+            treatment = raw_jump - expected_trend
+            
+            print(f"\n{route}:")
+            print(f"  Last pre:  {last_pre['avg_ridership']:7.1f} riders ({last_pre['date'].date()})")
+            print(f"  First post: {first_post['avg_ridership']:7.1f} riders ({first_post['date'].date()})")
+            print(f"  Raw jump: {raw_jump:+7.1f} riders")
+            print(f"  Expected from trend: {expected_trend:+7.1f} riders")
+            print(f"  Treatment effect: {treatment:+7.1f} riders ← Should match β₂ in ITS")
+
+    print("\nGround truth treatment effects:")
+    print("  Downtown:   +300 riders (immediate level change)")
+    print("  Suburban:   +200 riders (immediate level change)")
+    print("  Cross-town: +150 riders (immediate level change)")
+    print("  All slopes:    0 riders/week (no growth rate change)")
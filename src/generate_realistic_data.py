@@ -12,14 +12,19 @@ Designed to practice:
 - Communicating uncertainty
 - Identifying confounders
 - Making recommendations despite noise
+
+Note: the committed CSV was generated with the legacy np.random.seed(42)
+stream. This script draws from per-route SeedSequence streams, so running it
+overwrites that file with a different noise draw (same parameters and ground
+truth). See "Regenerating the data" in the README.
 """
 
-import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-# Set seed for reproducibility
-np.random.seed(42)
+from _longform import make_long_frame, spawn_route_seeds
+from _timebase import make_timebase
 
 # DATASET PARAMETERS
 
@@ -28,16 +33,6 @@ START_DATE = datetime(2020, 1, 6)  # Monday
 END_DATE = datetime(2024, 12, 30)  # Monday
 INTERVENTION_DATE = datetime(2024, 1, 1)
 
-# Generate weekly dates
-dates = []
-current_date = START_DATE
-while current_date <= END_DATE:
-    dates.append(current_date)
-    current_date += timedelta(days=7)
-
-n_weeks = len(dates)
-print(f"Generating {n_weeks} weeks of data ({START_DATE.date()} to {END_DATE.date()})")
-
 # ROUTE-SPECIFIC PARAMETERS (REALISTIC)
 
 # Much smaller effects than baseline, higher noise
@@ -103,180 +98,208 @@ confounders = {
 
 # GENERATE DATA
 
-def apply_competitor_effect(date, route_type):
+def apply_competitor_effect(dates, route_type):
     """Competitor bus service launched Jul 2023 - gradual negative effect."""
     launch_date = confounders['competitor_launch']['date']
-    if date < launch_date:
-        return 0
-    
-    weeks_since = (date - launch_date).days / 7
     ramp_weeks = confounders['competitor_launch']['ramp_weeks']
     max_effect = confounders['competitor_launch']['effect'][route_type]
     
+    # Weeks before launch clip to zero, so they get no effect
+    weeks_since = np.maximum(0, (dates - launch_date).days.values / 7)
+    
     # Ramp up over time, then stay constant
-    if weeks_since <= ramp_weeks:
-        return max_effect * (weeks_since / ramp_weeks)
-    else:
-        return max_effect
+    return np.where(weeks_since <= ramp_weeks,
+                    max_effect * (weeks_since / ramp_weeks),
+                    max_effect)
 
-def apply_gas_spike_effect(date, route_type):
+def apply_gas_spike_effect(dates, route_type):
     """Gas price spike Mar-Jun 2022 - temporary positive effect."""
     spike_start = confounders['gas_spike']['date']
     duration = confounders['gas_spike']['duration_weeks']
     spike_end = spike_start + timedelta(weeks=duration)
-    
-    if date < spike_start or date > spike_end:
-        return 0
-    
-    weeks_in = (date - spike_start).days / 7
     peak_effect = confounders['gas_spike']['peak_effect'][route_type]
     
+    in_spike = (dates >= spike_start) & (dates <= spike_end)
+    weeks_in = (dates - spike_start).days.values / 7
+    
     # Bell curve: rise to peak at midpoint, then fall
     progress = weeks_in / duration
-    return peak_effect * np.sin(progress * np.pi)
+    return np.where(in_spike, peak_effect * np.sin(progress * np.pi), 0.0)
 
-def apply_severe_winter_effect(date, route_type):
+def apply_severe_winter_effect(dates, route_type):
     """Severe winter Jan-Feb 2023 - temporary negative effect."""
     winter_start = confounders['severe_winter']['date']
     duration = confounders['severe_winter']['duration_weeks']
     winter_end = winter_start + timedelta(weeks=duration)
     
-    if date < winter_start or date > winter_end:
-        return 0
+    in_winter = (dates >= winter_start) & (dates <= winter_end)
+    return in_winter * confounders['severe_winter']['effect'][route_type]
+
+def build_route(route_type, params, seeds, dates, post_intervention,
+                weeks_since_intervention):
+    """Generate one route's weekly ridership; routes are independent of each other.
     
-    return confounders['severe_winter']['effect'][route_type]
+    Returns an (n_reps, n_weeks) array with one row per seed. The trend,
+    treatment, seasonality and confounder terms are computed once and shared
+    by every replication; only the noise differs.
+    """
+    n_weeks = len(dates)
+    
+    # Base trend, as a float buffer so the in-place sum below works for
+    # integer-valued params too
+    weeks_from_start = np.arange(n_weeks)
+    base_ridership = np.multiply(params['pre_trend'], weeks_from_start, dtype=float)
+    base_ridership += params['baseline']
+    
+    # Treatment effect: level change on the 0/1 post mask, plus any slope
+    # change (weeks_since_intervention is already zero before the intervention)
+    treatment = params['treatment_effect'] * post_intervention
+    slope_change = params['slope_change'] * weeks_since_intervention
+    
+    # Seasonality (stronger than baseline), looked up by month number
+    seasonal_offset = np.zeros(13)
+    seasonal_offset[[6, 7, 8]] = -params['seasonality_amp']  # Summer
+    seasonal_offset[[12, 1, 2]] = -params['seasonality_amp'] * 0.7  # Winter
+    seasonality = seasonal_offset[dates.month.values]
+    
+    # CONFOUNDERS
+    competitor = apply_competitor_effect(dates, route_type)
+    gas_effect = apply_gas_spike_effect(dates, route_type)
+    winter_effect = apply_severe_winter_effect(dates, route_type)
+    
+    # Combine everything, adding each term in place so the sum does not
+    # allocate a new array per addition
+    expected = base_ridership
+    for term in (treatment, slope_change, seasonality,
+                 competitor, gas_effect, winter_effect):
+        expected += term
+    
+    # Add noise (higher than baseline): all weeks of a replication drawn in
+    # one call, each replication from its own stream
+    actual = np.stack([np.random.default_rng(seed).normal(0, params['noise_std'], n_weeks)
+                       for seed in seeds])
+    actual += expected
+    
+    # Ensure non-negative
+    return np.maximum(actual, 0, out=actual)
 
-def generate_realistic_data():
-    """Generate complete realistic dataset with confounders."""
+def generate_realistic_data(n_reps=1, n_weeks=None, seed=42):
+    """Generate complete realistic dataset with confounders.
     
-    all_data = []
+    n_weeks sets the number of weekly observations from START_DATE (default:
+    run to END_DATE). n_reps > 1 stacks independent replications under a
+    leading `rep` column (see _longform.make_long_frame).
+    """
     
-    for route_type, params in route_params.items():
-        print(f"\nGenerating {route_type} data...")
-        
-        for i, date in enumerate(dates):
-            # Time variables
-            weeks_from_start = i
-            post_intervention = 1 if date >= INTERVENTION_DATE else 0
-            weeks_since_intervention = max(0, (date - INTERVENTION_DATE).days / 7) if post_intervention else 0
-            
-            # Base trend
-            base_ridership = params['baseline'] + (params['pre_trend'] * weeks_from_start)
-            
-            # Treatment effect (if post-intervention)
-            treatment = params['treatment_effect'] * post_intervention
-            slope_change = params['slope_change'] * weeks_since_intervention
-            
-            # Seasonality (stronger than baseline)
-            month = date.month
-            if month in [6, 7, 8]:  # Summer
-                seasonality = -params['seasonality_amp']
-            elif month in [12, 1, 2]:  # Winter
-                seasonality = -params['seasonality_amp'] * 0.7
-            else:
-                seasonality = 0
-            
-            # CONFOUNDERS
-            competitor = apply_competitor_effect(date, route_type)
-            gas_effect = apply_gas_spike_effect(date, route_type)
-            winter_effect = apply_severe_winter_effect(date, route_type)
-            
-            # Combine everything
-            expected = (base_ridership + treatment + slope_change + 
-                       seasonality + competitor + gas_effect + winter_effect)
-            
-            # Add noise (higher than baseline)
-            noise = np.random.normal(0, params['noise_std'])
-            actual = expected + noise
-            
-            # Ensure non-negative
-            actual = max(0, actual)
-            
-            all_data.append({
-                'date': date,
-                'route_type': route_type,
-                'avg_ridership': round(actual, 1),
-                'post_intervention': post_intervention,
-                'time_since_intervention': weeks_since_intervention
-            })
+    # Weekly dates and intervention timing (shared by all routes)
+    dates, post_intervention, weeks_since_intervention = make_timebase(
+        START_DATE, END_DATE, INTERVENTION_DATE, n_weeks=n_weeks)
+    print(f"Generating {len(dates)} weeks of data ({dates[0].date()} to {dates[-1].date()})")
+    
+    # Random streams for reproducibility: one per (rep, route)
+    seeds = spawn_route_seeds(seed, n_reps, len(route_params))
     
-    df = pd.DataFrame(all_data)
-    return df
+    # One task per route. The work is bulk NumPy, which releases the GIL,
+    # so threads avoid the start-up and pickling cost of worker processes.
+    with ThreadPoolExecutor(max_workers=len(route_params)) as executor:
+        futures = []
+        for i, (route_type, params) in enumerate(route_params.items()):
+            print(f"\nGenerating {route_type} data...")
+            futures.append(executor.submit(build_route, route_type, params,
+                                           seeds[i], dates,
+                                           post_intervention, weeks_since_intervention))
+        ridership = np.stack([future.result() for future in futures], axis=1)
+    
+    # Long-form table, already in route and date order
+    return make_long_frame(dates, list(route_params), ridership, post_intervention,
+                           weeks_since_intervention)
 
 # GENERATE AND SAVE
 
+if __name__ == '__main__':
+    df_realistic = generate_realistic_data()
 
-df_realistic = generate_realistic_data()
+    # Save
+    output_path = '../data/hard_mode/transit_ridership_realistic.csv'
+    df_realistic.to_csv(output_path, index=False)
 
-# Save
-output_path = '../data/hard_mode/transit_ridership_realistic.csv'
-df_realistic.to_csv(output_path, index=False)
+    print(f"Saved to: {output_path}")
+    print(f"Total observations: {len(df_realistic):,}")
+    print(f"Date range: {df_realistic['date'].min().date()} to {df_realistic['date'].max().date()}")
+    print(f"Route types: {df_realistic['route_type'].unique().tolist()}")
 
-print(f"Saved to: {output_path}")
-print(f"Total observations: {len(df_realistic):,}")
-print(f"Date range: {df_realistic['date'].min().date()} to {df_realistic['date'].max().date()}")
-print(f"Route types: {df_realistic['route_type'].unique().tolist()}")
+    # SUMMARY STATISTICS
 
-# SUMMARY STATISTICS
 
+    period_stats = (df_realistic
+                    .groupby(['route_type', 'post_intervention'], sort=False, observed=True)
+                    ['avg_ridership']
+                    .agg(['mean', 'std']))
 
-for route in ['Downtown', 'Suburban', 'Cross-town']:
-    route_data = df_realistic[df_realistic['route_type'] == route]
-    
-    pre = route_data[route_data['post_intervention'] == 0]['avg_ridership']
-    post = route_data[route_data['post_intervention'] == 1]['avg_ridership']
-    
-    print(f"\n{route}:")
-    print(f"  Pre-intervention mean:  {pre.mean():7.1f} riders (std: {pre.std():.1f})")
-    print(f"  Post-intervention mean: {post.mean():7.1f} riders (std: {post.std():.1f})")
-    print(f"  Naive difference:       {post.mean() - pre.mean():+7.1f} riders")
+    for route in ['Downtown', 'Suburban', 'Cross-town']:
+        pre = period_stats.loc[(route, 0)]
+        post = period_stats.loc[(route, 1)]
+        
+        print(f"\n{route}:")
+        print(f"  Pre-intervention mean:  {pre['mean']:7.1f} riders (std: {pre['std']:.1f})")
+        print(f"  Post-intervention mean: {post['mean']:7.1f} riders (std: {post['std']:.1f})")
+        print(f"  Naive difference:       {post['mean'] - pre['mean']:+7.1f} riders")
 
-# RAW JUMP AT INTERVENTION (for validation)
+    # RAW JUMP AT INTERVENTION (for validation)
 
-print("\nNote: These include confounders + noise, so won't exactly match")
-print("true treatment effects. That's the point - this is realistic!")
+    print("\nNote: These include confounders + noise, so won't exactly match")
+    print("true treatment effects. That's the point - this is realistic!")
 
-for route in ['Downtown', 'Suburban', 'Cross-town']:
-    route_data = df_realistic[df_realistic['route_type'] == route].sort_values('date')
-    
-    last_pre = route_data[route_data['date'] < INTERVENTION_DATE].iloc[-1]
-    first_post = route_data[route_data['date'] >= INTERVENTION_DATE].iloc[0]
-    
-    raw_jump = first_post['avg_ridership'] - last_pre['avg_ridership']
-    true_effect = route_params[route]['treatment_effect']
-    
-    print(f"\n{route}:")
-    print(f"  Last pre:  {last_pre['avg_ridership']:6.1f} riders ({last_pre['date'].date()})")
-    print(f"  First post: {first_post['avg_ridership']:6.1f} riders ({first_post['date'].date()})")
-    print(f"  Raw jump:  {raw_jump:+6.1f} riders")
-    print(f"  True treatment effect: {true_effect:+6.1f} riders")
-    print(f"  Note: Raw jump includes confounders + noise")
+    # Route i is rows i * n_weeks ... (i + 1) * n_weeks - 1 in date order, so
+    # the weeks either side of the intervention are read by position on the
+    # calendar the generator used
+    dates, post_intervention, _ = make_timebase(START_DATE, END_DATE, INTERVENTION_DATE)
+    n_weeks = len(dates)
+    first_post_week = int(np.searchsorted(post_intervention, 1))
+
+    if not 0 < first_post_week < n_weeks:
+        print("\nNo weeks on both sides of the intervention; skipping raw jump check.")
+    else:
+        for i, route in enumerate(route_params):
+            first_post_idx = i * n_weeks + first_post_week
+            last_pre = df_realistic.iloc[first_post_idx - 1]
+            first_post = df_realistic.iloc[first_post_idx]
+            
+            raw_jump = first_post['avg_ridership'] - last_pre['avg_ridership']
+            true_effect = route_params[route]['treatment_effect']
+            
+            print(f"\n{route}:")
+            print(f"  Last pre:  {last_pre['avg_ridership']:6.1f} riders ({last_pre['date'].date()})")
+            print(f"  First post: {first_post['avg_ridership']:6.1f} riders ({first_post['date'].date()})")
+            print(f"  Raw jump:  {raw_jump:+6.1f} riders")
+            print(f"  True treatment effect: {true_effect:+6.1f} riders")
+            print(f"  Note: Raw jump includes confounders + noise")
 
-# CONFOUNDER SUMMARY
+    # CONFOUNDER SUMMARY
 
 
-print("\n1. Competitor Bus Service (Jul 2023)")
-print("   - Gradual negative effect on ridership")
-print("   - Stronger impact on Downtown routes")
-print("   - Challenge: Happens 6 months BEFORE express lanes")
+    print("\n1. Competitor Bus Service (Jul 2023)")
+    print("   - Gradual negative effect on ridership")
+    print("   - Stronger impact on Downtown routes")
+    print("   - Challenge: Happens 6 months BEFORE express lanes")
 
-print("\n2. Gas Price Spike (Mar-Jun 2022)")
-print("   - Temporary boost to transit ridership")
-print("   - Bell curve effect over 4 months")
-print("   - Challenge: Well before intervention, but affects pre-trend")
+    print("\n2. Gas Price Spike (Mar-Jun 2022)")
+    print("   - Temporary boost to transit ridership")
+    print("   - Bell curve effect over 4 months")
+    print("   - Challenge: Well before intervention, but affects pre-trend")
 
-print("\n3. Severe Winter (Jan-Feb 2023)")
-print("   - 2-month dip in ridership")
-print("   - All routes affected")
-print("   - Challenge: Creates noise in pre-period")
+    print("\n3. Severe Winter (Jan-Feb 2023)")
+    print("   - 2-month dip in ridership")
+    print("   - All routes affected")
+    print("   - Challenge: Creates noise in pre-period")
 
 
-print("\nGround truth treatment effects:")
-for route, params in route_params.items():
-    print(f"  {route:12s}: {params['treatment_effect']:+3d} riders (immediate level change)")
+    print("\nGround truth treatment effects:")
+    for route, params in route_params.items():
+        print(f"  {route:12s}: {params['treatment_effect']:+3d} riders (immediate level change)")
 
-print("\nExpected challenges:")
-print("  - Small effects + high noise = wider confidence intervals")
-print("  - Competitor confounder may bias results downward")
-print("  - Gas spike affects pre-trend estimation")
-print("  - Some effects may not reach statistical significance")
+    print("\nExpected challenges:")
+    print("  - Small effects + high noise = wider confidence intervals")
+    print("  - Competitor confounder may bias results downward")
+    print("  - Gas spike affects pre-trend estimation")
+    print("  - Some effects may not reach statistical significance")